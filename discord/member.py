@@ -399,6 +399,8 @@ class Member(discord.abc.Messageable, _UserTag):
         if original != modified:
             to_return = User._copy(self._user)
             u.name, u._avatar, u.discriminator, u._public_flags = modified
+            u.discriminator = sys.intern(u.discriminator)
+            u._update_cache()
             # Signal to dispatch on_user_update
             return to_return, u
 
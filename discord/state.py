@@ -583,7 +583,7 @@ class ConnectionState:
             except KeyError:
                 continue
             else:
-                self.user._relationships[r_id] = Relationship(state=self, data=relationship)
+                self.user._add_relationship(r_id, Relationship(state=self, data=relationship))
 
         for pm in data.get('private_channels', []):
             factory, _ = _channel_factory(pm['type'])
@@ -1408,7 +1408,7 @@ class ConnectionState:
         key = int(data['id'])
         old = self.user.get_relationship(key)
         new = Relationship(state=self, data=data)
-        self.user._relationships[key] = new
+        self.user._add_relationship(key, new)
         if old is not None:
             self.dispatch('relationship_update', old, new)
         else:
@@ -1417,7 +1417,7 @@ class ConnectionState:
     def parse_relationship_remove(self, data):
         key = int(data['id'])
         try:
-            old = self.user._relationships.pop(key)
+            old = self.user._remove_relationship(key)
         except KeyError:
             pass
         else:
@@ -21,10 +21,10 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING
 FROM, OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER
 DEALINGS IN THE SOFTWARE.
 """
-from collections import namedtuple
+import sys
 from typing import Any, Dict, List, Optional, Type, TypeVar, TYPE_CHECKING
 import discord.abc
-from .utils import snowflake_time, _bytes_to_base64_data, parse_time
+from .utils import MISSING, snowflake_time, _bytes_to_base64_data, parse_time
 from .enums import DefaultAvatar, RelationshipType, UserFlags, HypeSquadHouse, PremiumType, try_enum
 from .errors import ClientException
 from .colour import Colour
@@ -38,8 +38,47 @@ __all__ = (
 )
 
 
-class Profile(namedtuple('Profile', 'flags user mutual_guilds connected_accounts premium_since')):
-    __slots__ = ()
+# all of the flags exposed by Profile are single bits, so they are
+# tested by their bit position rather than by mask comparison
+_STAFF_BIT = UserFlags.staff.value.bit_length() - 1
+_PARTNER_BIT = UserFlags.partner.value.bit_length() - 1
+_BUG_HUNTER_BIT = UserFlags.bug_hunter.value.bit_length() - 1
+_EARLY_SUPPORTER_BIT = UserFlags.early_supporter.value.bit_length() - 1
+_HYPESQUAD_BIT = UserFlags.hypesquad.value.bit_length() - 1
+_TEAM_USER_BIT = UserFlags.team_user.value.bit_length() - 1
+_SYSTEM_BIT = UserFlags.system.value.bit_length() - 1
+_HYPESQUAD_BITS = (
+    UserFlags.hypesquad_bravery.value.bit_length() - 1,
+    UserFlags.hypesquad_brilliance.value.bit_length() - 1,
+    UserFlags.hypesquad_balance.value.bit_length() - 1,
+)
+_HYPESQUAD_HOUSES = tuple(HypeSquadHouse)
+
+
+class Profile:
+    __slots__ = ('flags', 'user', 'mutual_guilds', 'connected_accounts', 'premium_since')
+
+    def __init__(self, *, flags, user, mutual_guilds, connected_accounts, premium_since) -> None:
+        self.flags = flags
+        self.user = user
+        self.mutual_guilds = mutual_guilds
+        self.connected_accounts = connected_accounts
+        self.premium_since = premium_since
+
+    def __repr__(self) -> str:
+        return f'<Profile user={self.user!r} flags={self.flags} premium_since={self.premium_since!r}>'
+
+    def _key(self):
+        return (self.flags, self.user, self.mutual_guilds, self.connected_accounts, self.premium_since)
+
+    def __eq__(self, other: Any) -> bool:
+        return isinstance(other, Profile) and self._key() == other._key()
+
+    def __ne__(self, other: Any) -> bool:
+        return not self.__eq__(other)
+
+    def __hash__(self) -> int:
+        return hash(self._key())
 
     @property
     def nitro(self):
@@ -47,46 +86,56 @@ class Profile(namedtuple('Profile', 'flags user mutual_guilds connected_accounts
 
     premium = nitro
 
-    def _has_flag(self, o):
-        v = o.value
-        return (self.flags & v) == v
+    def _has_flag(self, bit):
+        return (self.flags >> bit) & 1 == 1
 
     @property
     def staff(self):
-        return self._has_flag(UserFlags.staff)
+        return self._has_flag(_STAFF_BIT)
 
     @property
     def partner(self):
-        return self._has_flag(UserFlags.partner)
+        return self._has_flag(_PARTNER_BIT)
 
     @property
     def bug_hunter(self):
-        return self._has_flag(UserFlags.bug_hunter)
+        return self._has_flag(_BUG_HUNTER_BIT)
 
     @property
     def early_supporter(self):
-        return self._has_flag(UserFlags.early_supporter)
+        return self._has_flag(_EARLY_SUPPORTER_BIT)
 
     @property
     def hypesquad(self):
-        return self._has_flag(UserFlags.hypesquad)
+        return self._has_flag(_HYPESQUAD_BIT)
 
     @property
     def hypesquad_houses(self):
-        flags = (UserFlags.hypesquad_bravery, UserFlags.hypesquad_brilliance, UserFlags.hypesquad_balance)
-        return [house for house, flag in zip(HypeSquadHouse, flags) if self._has_flag(flag)]
+        flags = self.flags
+        return [house for house, bit in zip(_HYPESQUAD_HOUSES, _HYPESQUAD_BITS) if (flags >> bit) & 1]
 
     @property
     def team_user(self):
-        return self._has_flag(UserFlags.team_user)
+        return self._has_flag(_TEAM_USER_BIT)
 
     @property
     def system(self):
-        return self._has_flag(UserFlags.system)
+        return self._has_flag(_SYSTEM_BIT)
 
 
 BU = TypeVar('BU', bound='BaseUser')
 
+_DEFAULT_AVATAR_COUNT = len(DefaultAvatar)
+
+# indexed by FriendFlags value, these are only ever read
+_FRIEND_SOURCE_FLAGS = (
+    {},
+    {'mutual_guilds': True},
+    {'mutual_friends': True},
+    {'mutual_guilds': True, 'mutual_friends': True},
+    {'all': True},
+)
+
 
 class _UserTag:
     __slots__ = ()
@@ -105,6 +154,8 @@ class BaseUser(_UserTag):
         'system',
         '_public_flags',
         '_state',
+        '_cached_avatar',
+        '_cached_default_avatar',
     )
 
     if TYPE_CHECKING:
@@ -118,6 +169,8 @@ class BaseUser(_UserTag):
         _banner: Optional[str]
         _accent_colour: Optional[str]
         _public_flags: int
+        _cached_avatar: Optional[Asset]
+        _cached_default_avatar: Optional[Asset]
 
     def __init__(self, *, state, data) -> None:
         self._state = state
@@ -133,6 +186,9 @@ class BaseUser(_UserTag):
         return f'{self.name}#{self.discriminator}'
 
     def __eq__(self, other: Any) -> bool:
+        # comparing two users of the same type is by far the most common case
+        if other.__class__ is self.__class__:
+            return other.id == self.id
         return isinstance(other, _UserTag) and other.id == self.id
 
     def __ne__(self, other: Any) -> bool:
@@ -144,13 +200,20 @@ class BaseUser(_UserTag):
     def _update(self, data) -> None:
         self.name = data['username']
         self.id = int(data['id'])
-        self.discriminator = data['discriminator']
+        self.discriminator = sys.intern(data['discriminator'])
         self._avatar = data['avatar']
         self._banner = data.get('banner', None)
         self._accent_colour = data.get('accent_color', None)
         self._public_flags = data.get('public_flags', 0)
         self.bot = data.get('bot', False)
         self.system = data.get('system', False)
+        self._update_cache()
+
+    def _update_cache(self) -> None:
+        # derived objects are built lazily on first access and
+        # must be discarded whenever the raw fields they come from change
+        self._cached_avatar = None
+        self._cached_default_avatar = None
 
     @classmethod
     def _copy(cls: Type[BU], user: BU) -> BU:
@@ -165,6 +228,7 @@ class BaseUser(_UserTag):
         self.bot = user.bot
         self._state = user._state
         self._public_flags = user._public_flags
+        self._update_cache()
 
         return self
 
@@ -189,14 +253,21 @@ class BaseUser(_UserTag):
         If the user does not have a traditional avatar, ``None`` is returned.
         If you want the avatar that a user has displayed, consider :attr:`display_avatar`.
         """
-        if self._avatar is not None:
-            return Asset._from_avatar(self._state, self.id, self._avatar)
-        return None
+        if self._avatar is None:
+            return None
+        avatar = self._cached_avatar
+        if avatar is None:
+            avatar = self._cached_avatar = Asset._from_avatar(self._state, self.id, self._avatar)
+        return avatar
 
     @property
     def default_avatar(self) -> Asset:
         """:class:`Asset`: Returns the default avatar for a given user. This is calculated by the user's discriminator."""
-        return Asset._from_default_avatar(self._state, int(self.discriminator) % len(DefaultAvatar))
+        avatar = self._cached_default_avatar
+        if avatar is None:
+            index = int(self.discriminator) % _DEFAULT_AVATAR_COUNT
+            avatar = self._cached_default_avatar = Asset._from_default_avatar(self._state, index)
+        return avatar
 
     @property
     def display_avatar(self) -> Asset:
@@ -322,7 +393,11 @@ class BaseUser(_UserTag):
         if message.mention_everyone:
             return True
 
-        return any(user.id == self.id for user in message.mentions)
+        user_id = self.id
+        for user in message.mentions:
+            if user.id == user_id:
+                return True
+        return False
 
 
 class ClientUser(BaseUser):
@@ -369,7 +444,7 @@ class ClientUser(BaseUser):
         Specifies if the user has MFA turned on and working.
     """
 
-    __slots__ = BaseUser.__slots__ + ('email', 'locale', '_flags', 'verified', 'mfa_enabled', 'premium', 'premium_type', '_relationships', '__weakref__')
+    __slots__ = BaseUser.__slots__ + ('email', 'locale', '_flags', 'verified', 'mfa_enabled', 'premium', 'premium_type', '_premium_type', '_relationships', '_friends', '_blocked', '__weakref__')
 
     if TYPE_CHECKING:
         verified: bool
@@ -378,8 +453,14 @@ class ClientUser(BaseUser):
         _flags: int
 
     def __init__(self, *, state, data) -> None:
+        # compared against by _update, which runs inside BaseUser.__init__
+        self._premium_type = MISSING
         super().__init__(state=state, data=data)
         self._relationships = {}
+        # subsets of _relationships keyed by user ID, kept in sync by
+        # _add_relationship and _remove_relationship
+        self._friends = {}
+        self._blocked = {}
 
     def __repr__(self) -> str:
         return (
@@ -396,7 +477,27 @@ class ClientUser(BaseUser):
         self._flags = data.get('flags', 0)
         self.mfa_enabled = data.get('mfa_enabled', False)
         self.premium = data.get('premium', False)
-        self.premium_type = try_enum(PremiumType, data.get('premium_type', None))
+        premium_type = data.get('premium_type', None)
+        # the raw value rarely changes between updates so the enum is reused
+        if premium_type != self._premium_type:
+            self._premium_type = premium_type
+            self.premium_type = try_enum(PremiumType, premium_type)
+
+    def _add_relationship(self, user_id, relationship) -> None:
+        self._relationships[user_id] = relationship
+        self._friends.pop(user_id, None)
+        self._blocked.pop(user_id, None)
+        if relationship.type is RelationshipType.friend:
+            self._friends[user_id] = relationship
+        elif relationship.type is RelationshipType.blocked:
+            self._blocked[user_id] = relationship
+
+    def _remove_relationship(self, user_id):
+        # raises KeyError if there is no relationship with the user
+        relationship = self._relationships.pop(user_id)
+        self._friends.pop(user_id, None)
+        self._blocked.pop(user_id, None)
+        return relationship
 
     def get_relationship(self, user_id):
         """Retrieves the :class:`Relationship` if applicable.
@@ -430,7 +531,7 @@ class ClientUser(BaseUser):
         .. note::
             This can only be used by non-bot accounts.
         """
-        return [r.user for r in self._relationships.values() if r.type is RelationshipType.friend]
+        return [r.user for r in self._friends.values()]
 
     @property
     def blocked(self):
@@ -441,7 +542,7 @@ class ClientUser(BaseUser):
 
             This can only be used by non-bot accounts.
         """
-        return [r.user for r in self._relationships.values() if r.type is RelationshipType.blocked]
+        return [r.user for r in self._blocked.values()]
 
     async def edit(self, **fields):
         """|coro|
@@ -480,15 +581,13 @@ class ClientUser(BaseUser):
         :class:`ClientUser`
             The newly edited client user.
         """
-        try:
-            avatar_bytes = fields['avatar']
-        except KeyError:
+        avatar_bytes = fields.get('avatar', MISSING)
+        if avatar_bytes is MISSING:
             avatar = self.avatar
+        elif avatar_bytes is not None:
+            avatar = _bytes_to_base64_data(avatar_bytes)
         else:
-            if avatar_bytes is not None:
-                avatar = _bytes_to_base64_data(avatar_bytes)
-            else:
-                avatar = None
+            avatar = None
 
         not_bot_account = not self.bot
         password = fields.get('password')
@@ -527,8 +626,6 @@ class ClientUser(BaseUser):
                 http._token(data['token'], bot=False)
             except KeyError:
                 pass
-        if avatar is not None:
-            avatar = _bytes_to_base64_data(avatar)
 
         self._update(data)
 
@@ -648,9 +745,7 @@ class ClientUser(BaseUser):
 
         friend_flags = kwargs.pop('friend_source_flags', None)
         if friend_flags:
-            dicts = [{}, {'mutual_guilds': True}, {'mutual_friends': True},
-            {'mutual_guilds': True, 'mutual_friends': True}, {'all': True}]
-            payload.update({'friend_source_flags': dicts[friend_flags.value]})
+            payload.update({'friend_source_flags': _FRIEND_SOURCE_FLAGS[friend_flags.value]})
 
         guild_positions = kwargs.pop('guild_positions', None)
         if guild_positions:
@@ -815,10 +910,7 @@ class User(BaseUser, discord.abc.Messageable):
         .. note::
             This can only be used by non-bot accounts.
         """
-        r = self.relationship
-        if r is None:
-            return False
-        return r.type is RelationshipType.friend
+        return self.id in self._state.user._friends
 
     def is_blocked(self):
         """:class:`bool`: Checks if the user is blocked.
@@ -826,10 +918,7 @@ class User(BaseUser, discord.abc.Messageable):
         .. note::
             This can only be used by non-bot accounts.
         """
-        r = self.relationship
-        if r is None:
-            return False
-        return r.type is RelationshipType.blocked
+        return self.id in self._state.user._blocked
 
     async def block(self):
         """|coro|